@@ -4,12 +4,31 @@
 input=$(cat)
 
 # Extract working directory
-cwd=$(echo "$input" | sed -n 's/.*"current_dir":"\([^"]*\)".*/\1/p')
+cwd=""
+case $input in
+  *'"current_dir":"'*)
+    cwd=${input#*\"current_dir\":\"}
+    cwd=${cwd%%\"*}
+    ;;
+esac
 
 # Git information
-if git -C "$cwd" rev-parse --git-dir > /dev/null 2>&1; then
-  repo_name=$(echo "$cwd" | sed "s|^$HOME/github/||")
-  branch=$(git -C "$cwd" --no-optional-locks rev-parse --abbrev-ref HEAD 2>/dev/null)
+if git_dir=$(git -C "$cwd" rev-parse --git-dir 2>/dev/null); then
+  repo_name=${cwd#"$HOME/github/"}
+
+  # Branch: read HEAD directly, only ask git for detached HEADs
+  case $git_dir in
+    /*) ;;
+    *) git_dir="$cwd/$git_dir" ;;
+  esac
+  head=""
+  { IFS= read -r head < "$git_dir/HEAD"; } 2>/dev/null
+  case $head in
+    # Reftable repos keep a stub HEAD; the real ref lives in the reftable
+    "ref: refs/heads/.invalid") branch=$(git -C "$cwd" --no-optional-locks rev-parse --abbrev-ref HEAD 2>/dev/null) ;;
+    "ref: refs/heads/"*) branch=${head#ref: refs/heads/} ;;
+    *) branch=$(git -C "$cwd" --no-optional-locks rev-parse --abbrev-ref HEAD 2>/dev/null) ;;
+  esac
 
   staged=$(git -C "$cwd" --no-optional-locks diff --cached --name-only 2>/dev/null | wc -l)
   unstaged=$(git -C "$cwd" --no-optional-locks diff --name-only 2>/dev/null | wc -l)
@@ -1,6 +1,6 @@
 import { mkdir } from "node:fs/promises";
 import { dirname } from "node:path";
-import { DatabaseSync } from "node:sqlite";
+import { DatabaseSync, type StatementSync } from "node:sqlite";
 import { Type } from "typebox";
 import { Value } from "typebox/value";
 
@@ -38,6 +38,7 @@ const CountRowSchema = Type.Object({
 
 export class SqliteConductorStore implements ConductorStore {
   private db: DatabaseSync | undefined;
+  private readonly statements = new Map<string, StatementSync>();
 
   constructor(private readonly dbPath: string) {}
 
@@ -89,90 +90,78 @@ export class SqliteConductorStore implements ConductorStore {
 
   createRun(run: RunRecord): Promise<void> {
     const validated = Value.Parse(RunRecordSchema, run);
-    this.getDatabase()
-      .prepare(
-        `INSERT INTO runs
-          (run_id, owner, repo, issue_number, status, paused, payload_json, created_at, updated_at)
-          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)`,
-      )
-      .run(
-        validated.runId,
-        validated.owner,
-        validated.repo,
-        validated.issueNumber,
-        validated.status,
-        validated.paused ? 1 : 0,
-        JSON.stringify(validated),
-        validated.createdAt,
-        validated.updatedAt,
-      );
+    this.statement(
+      `INSERT INTO runs
+        (run_id, owner, repo, issue_number, status, paused, payload_json, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)`,
+    ).run(
+      validated.runId,
+      validated.owner,
+      validated.repo,
+      validated.issueNumber,
+      validated.status,
+      validated.paused ? 1 : 0,
+      JSON.stringify(validated),
+      validated.createdAt,
+      validated.updatedAt,
+    );
     return Promise.resolve();
   }
 
   updateRun(run: RunRecord): Promise<void> {
     const validated = Value.Parse(RunRecordSchema, run);
-    const result = this.getDatabase()
-      .prepare(
-        `UPDATE runs
-          SET status = ?, paused = ?, payload_json = ?, updated_at = ?
-          WHERE run_id = ?`,
-      )
-      .run(
-        validated.status,
-        validated.paused ? 1 : 0,
-        JSON.stringify(validated),
-        validated.updatedAt,
-        validated.runId,
-      );
+    const result = this.statement(
+      `UPDATE runs
+        SET status = ?, paused = ?, payload_json = ?, updated_at = ?
+        WHERE run_id = ?`,
+    ).run(
+      validated.status,
+      validated.paused ? 1 : 0,
+      JSON.stringify(validated),
+      validated.updatedAt,
+      validated.runId,
+    );
     if (result.changes === 0) throw new Error(`Run not found: ${validated.runId}`);
     return Promise.resolve();
   }
 
   getRun(runId: string): Promise<RunRecord | undefined> {
-    const row = this.getDatabase()
-      .prepare("SELECT payload_json FROM runs WHERE run_id = ?")
-      .get(runId);
+    const row = this.statement("SELECT payload_json FROM runs WHERE run_id = ?").get(runId);
     return Promise.resolve(row === undefined ? undefined : parseRunRow(row, "run row"));
   }
 
   listRuns(): Promise<RunRecord[]> {
     return Promise.resolve(
-      this.getDatabase()
-        .prepare("SELECT payload_json FROM runs ORDER BY created_at ASC")
+      this.statement("SELECT payload_json FROM runs ORDER BY created_at ASC")
         .all()
         .map((row) => parseRunRow(row, "run row")),
     );
   }
 
   getActiveRun(owner: string, repo: string, issueNumber: number): Promise<RunRecord | undefined> {
-    const row = this.getDatabase()
-      .prepare(
-        `SELECT payload_json FROM runs
-         WHERE owner = ? AND repo = ? AND issue_number = ? AND status NOT IN ('done', 'blocked')
-         ORDER BY created_at ASC LIMIT 1`,
-      )
-      .get(owner, repo, issueNumber);
+    const row = this.statement(
+      `SELECT payload_json FROM runs
+       WHERE owner = ? AND repo = ? AND issue_number = ? AND status NOT IN ('done', 'blocked')
+       ORDER BY created_at ASC LIMIT 1`,
+    ).get(owner, repo, issueNumber);
     return Promise.resolve(row === undefined ? undefined : parseRunRow(row, "active run row"));
   }
 
   appendEvent(event: RunEvent): Promise<void> {
     const validated = Value.Parse(RunEventSchema, event);
-    this.getDatabase()
-      .prepare(
-        `INSERT INTO run_events (run_id, kind, payload_json, created_at)
-         VALUES (?, ?, ?, ?)`,
-      )
-      .run(validated.runId, validated.kind, JSON.stringify(validated), validated.createdAt);
+    this.statement(
+      `INSERT INTO run_events (run_id, kind, payload_json, created_at)
+       VALUES (?, ?, ?, ?)`,
+    ).run(validated.runId, validated.kind, JSON.stringify(validated), validated.createdAt);
     return Promise.resolve();
   }
 
   listEvents(runId: string, limit = 100): Promise<RunEvent[]> {
     return Promise.resolve(
-      this.getDatabase()
-        .prepare(
-          `SELECT payload_json FROM run_events
+      this.statement(
+        `SELECT payload_json FROM run_events
          WHERE run_id = ? ORDER BY id DESC LIMIT ?`,
-        )
+      )
         .all(runId, limit)
         .map((row) => parseEventRow(row, "event row"))
         .toReversed(),
@@ -184,33 +173,31 @@ export class SqliteConductorStore implements ConductorStore {
       ...delivery,
       status: delivery.status ?? "received",
     });
-    const result = this.getDatabase()
-      .prepare(
-        `INSERT OR IGNORE INTO github_deliveries
-          (delivery_id, event_name, payload_json, status, received_at)
-          VALUES (?, ?, ?, ?, ?)`,
-      )
-      .run(
-        validated.deliveryId,
-        validated.eventName,
-        JSON.stringify(validated),
-        validated.status ?? "received",
-        validated.receivedAt,
-      );
+    const result = this.statement(
+      `INSERT OR IGNORE INTO github_deliveries
+        (delivery_id, event_name, payload_json, status, received_at)
+        VALUES (?, ?, ?, ?, ?)`,
+    ).run(
+      validated.deliveryId,
+      validated.eventName,
+      JSON.stringify(validated),
+      validated.status ?? "received",
+      validated.receivedAt,
+    );
     return Promise.resolve(result.changes > 0);
   }
 
   hasDelivery(deliveryId: string): Promise<boolean> {
-    const row = this.getDatabase()
-      .prepare("SELECT COUNT(*) AS count FROM github_deliveries WHERE delivery_id = ?")
-      .get(deliveryId);
+    const row = this.statement(
+      "SELECT COUNT(*) AS count FROM github_deliveries WHERE delivery_id = ?",
+    ).get(deliveryId);
     return Promise.resolve(Value.Parse(CountRowSchema, row).count > 0);
   }
 
   getDelivery(deliveryId: string): Promise<WebhookDelivery | undefined> {
-    const row = this.getDatabase()
-      .prepare("SELECT payload_json FROM github_deliveries WHERE delivery_id = ?")
-      .get(deliveryId);
+    const row = this.statement(
+      "SELECT payload_json FROM github_deliveries WHERE delivery_id = ?",
+    ).get(deliveryId);
     return Promise.resolve(
       row === undefined
         ? undefined
@@ -231,9 +218,9 @@ export class SqliteConductorStore implements ConductorStore {
       nextAttemptAt?: string;
     } = {},
   ): Promise<void> {
-    const row = this.getDatabase()
-      .prepare("SELECT payload_json FROM github_deliveries WHERE delivery_id = ?")
-      .get(deliveryId);
+    const row = this.statement(
+      "SELECT payload_json FROM github_deliveries WHERE delivery_id = ?",
+    ).get(deliveryId);
     if (row === undefined) throw new Error(`Webhook delivery not found: ${deliveryId}`);
     const delivery = Value.Parse(
       WebhookDeliverySchema,
@@ -244,9 +231,9 @@ export class SqliteConductorStore implements ConductorStore {
       status,
       ...details,
     });
-    this.getDatabase()
-      .prepare("UPDATE github_deliveries SET status = ?, payload_json = ? WHERE delivery_id = ?")
-      .run(status, JSON.stringify(updated), deliveryId);
+    this.statement(
+      "UPDATE github_deliveries SET status = ?, payload_json = ? WHERE delivery_id = ?",
+    ).run(status, JSON.stringify(updated), deliveryId);
     return Promise.resolve();
   }
 
@@ -254,10 +241,9 @@ export class SqliteConductorStore implements ConductorStore {
     status: NonNullable<WebhookDelivery["status"]>,
   ): Promise<WebhookDelivery[]> {
     return Promise.resolve(
-      this.getDatabase()
-        .prepare(
-          "SELECT payload_json FROM github_deliveries WHERE status = ? ORDER BY received_at ASC",
-        )
+      this.statement(
+        "SELECT payload_json FROM github_deliveries WHERE status = ? ORDER BY received_at ASC",
+      )
         .all(status)
         .map((row) =>
           Value.Parse(
@@ -269,9 +255,7 @@ export class SqliteConductorStore implements ConductorStore {
   }
 
   getGitHubSyncState(key: string): Promise<GitHubSyncState | undefined> {
-    const row = this.getDatabase()
-      .prepare("SELECT payload_json FROM github_sync_state WHERE key = ?")
-      .get(key);
+    const row = this.statement("SELECT payload_json FROM github_sync_state WHERE key = ?").get(key);
     return Promise.resolve(
       row === undefined
         ? undefined
@@ -284,41 +268,34 @@ export class SqliteConductorStore implements ConductorStore {
 
   setGitHubSyncState(state: GitHubSyncState): Promise<void> {
     const validated = Value.Parse(GitHubSyncStateSchema, state);
-    this.getDatabase()
-      .prepare(
-        `INSERT INTO github_sync_state (key, payload_json, updated_at)
-         VALUES (?, ?, ?)
-         ON CONFLICT(key) DO UPDATE SET payload_json = excluded.payload_json, updated_at = excluded.updated_at`,
-      )
-      .run(validated.key, JSON.stringify(validated), validated.updatedAt);
+    this.statement(
+      `INSERT INTO github_sync_state (key, payload_json, updated_at)
+       VALUES (?, ?, ?)
+       ON CONFLICT(key) DO UPDATE SET payload_json = excluded.payload_json, updated_at = excluded.updated_at`,
+    ).run(validated.key, JSON.stringify(validated), validated.updatedAt);
     return Promise.resolve();
   }
 
   gc(options: StoreGcOptions = {}): Promise<StoreGcResult> {
     const validated = Value.Parse(StoreGcOptionsSchema, options);
     const cutoff = gcCutoffIso(validated.olderThanDays ?? DEFAULT_GC_RETENTION_DAYS);
-    const db = this.getDatabase();
-    const deletedEvents = db
-      .prepare(
-        `DELETE FROM run_events
-         WHERE created_at < ?
-           AND run_id IN (
-             SELECT run_id FROM runs
-             WHERE status IN ('done', 'blocked') AND updated_at < ?
-           )`,
-      )
-      .run(cutoff, cutoff).changes;
-    const deletedDeliveries = db
-      .prepare(
-        `DELETE FROM github_deliveries
-         WHERE received_at < ? AND status IN ('processed', 'failed')`,
-      )
-      .run(cutoff).changes;
-    db.prepare("DELETE FROM github_sync_state WHERE updated_at < ?").run(cutoff);
+    const deletedEvents = this.statement(
+      `DELETE FROM run_events
+       WHERE created_at < ?
+         AND run_id IN (
+           SELECT run_id FROM runs
+           WHERE status IN ('done', 'blocked') AND updated_at < ?
+         )`,
+    ).run(cutoff, cutoff).changes;
+    const deletedDeliveries = this.statement(
+      `DELETE FROM github_deliveries
+       WHERE received_at < ? AND status IN ('processed', 'failed')`,
+    ).run(cutoff).changes;
+    this.statement("DELETE FROM github_sync_state WHERE updated_at < ?").run(cutoff);
     this.optimize();
     this.checkpointWal();
     const vacuumed = validated.vacuum ?? true;
-    if (vacuumed) db.exec("VACUUM");
+    if (vacuumed) this.getDatabase().exec("VACUUM");
     return Promise.resolve(
       Value.Parse(StoreGcResultSchema, {
         deletedEvents,
@@ -330,6 +307,7 @@ export class SqliteConductorStore implements ConductorStore {
   }
 
   close(): void {
+    this.statements.clear();
     this.db?.close();
     this.db = undefined;
   }
@@ -339,12 +317,23 @@ export class SqliteConductorStore implements ConductorStore {
     return this.db;
   }
 
+  private statement(sql: string): StatementSync {
+    let statement = this.statements.get(sql);
+    if (statement === undefined) {
+      statement = this.getDatabase().prepare(sql);
+      this.statements.set(sql, statement);
+    }
+    return statement;
+  }
+
   private applyRuntimePragmas(): void {
     this.getDatabase().exec(`
       PRAGMA journal_mode = WAL;
       PRAGMA synchronous = NORMAL;
       PRAGMA busy_timeout = 5000;
       PRAGMA temp_store = MEMORY;
+      PRAGMA cache_size = -64000;
+      PRAGMA mmap_size = 268435456;
       PRAGMA wal_autocheckpoint = 1000;
     `);
   }